@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, after_this_request
 from s3_inventory_search import search_inventory
 from s3_inventory_utils import get_latest_inventory_manifests
 from s3_utils import get_s3_client
@@ -6,54 +6,372 @@ import pandas as pd
 import os
 import json
 from datetime import datetime
+import time
 import boto3
 import traceback
 import logging
+import hashlib
+import threading
+import sqlite3
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
 from dotenv import load_dotenv
 from s3_path_size import get_path_size
-import io
+
+# Prefer orjson (fastest), then ujson, then stdlib json for cache files
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = None
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (DEBUG forces format-string construction everywhere; keep
+# production at INFO and opt in to DEBUG locally when needed)
+logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Serve API responses through orjson/ujson instead of Flask's stdlib json
+if _fast_json is not None:
+    from flask.json.provider import JSONProvider
+
+    class FastJSONProvider(JSONProvider):
+        """Flask JSON provider backed by the fastest available JSON library."""
+
+        def dumps(self, obj, **kwargs):
+            result = _fast_json.dumps(obj)
+            return result.decode('utf-8') if isinstance(result, bytes) else result
+
+        def loads(self, s, **kwargs):
+            return _fast_json.loads(s)
+
+    app.json = FastJSONProvider(app)
+
 # File paths for storing history
 BUCKET_HISTORY_FILE = 'bucket_history.json'
+MANIFEST_CACHE_DB = 'manifest_cache.db'
+# Legacy JSON cache, imported into SQLite on first load if present
 MANIFEST_CACHE_FILE = 'manifest_cache.json'
 
+@lru_cache(maxsize=1)
+def _get_client():
+    """Return a process-wide S3 client, created once and reused across requests."""
+    return get_s3_client()
+
+# Background executor for S3-bound work submitted with async=true, so the
+# WSGI worker is released immediately instead of blocking for the full query
+_job_executor = ThreadPoolExecutor(max_workers=8)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# Finished jobs hold their full result payload until polled; drop ones no
+# client ever collects so abandoned jobs can't grow _jobs forever
+JOB_RESULT_TTL_SECONDS = 15 * 60
+
+def _purge_stale_jobs():
+    """Drop finished jobs nobody collected in time. Caller holds _jobs_lock."""
+    cutoff = time.monotonic() - JOB_RESULT_TTL_SECONDS
+    stale = [job_id for job_id, entry in _jobs.items()
+             if entry['finished_at'] is not None and entry['finished_at'] < cutoff]
+    for job_id in stale:
+        del _jobs[job_id]
+    if stale:
+        logger.info(f"Purged {len(stale)} uncollected finished jobs")
+
+def _submit_job(func, *args):
+    """Run func on the background executor and return a pollable job id."""
+    job_id = uuid4().hex
+    future = _job_executor.submit(func, *args)
+    entry = {'future': future, 'finished_at': None}
+    future.add_done_callback(
+        lambda f: entry.__setitem__('finished_at', time.monotonic()))
+    with _jobs_lock:
+        _purge_stale_jobs()
+        _jobs[job_id] = entry
+    return job_id
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a background job; returns its result once it has finished."""
+    with _jobs_lock:
+        _purge_stale_jobs()
+        entry = _jobs.get(job_id)
+
+    if entry is None:
+        return jsonify({'error': f'Job {job_id} not found'}), 404
+
+    future = entry['future']
+
+    if not future.done():
+        return jsonify({'job_id': job_id, 'status': 'running'})
+
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {str(e)}")
+        return jsonify({'job_id': job_id, 'status': 'failed', 'error': str(e)}), 500
+
+    return jsonify({'job_id': job_id, 'status': 'finished', 'result': result})
+
+# Known AWS credential/permission errors: (needle, response message, HTTP status)
+_AWS_ERRORS = (
+    ('Missing required AWS credentials',
+     'AWS credentials are missing. Please check your .env file.', 401),
+    ('Invalid AWS credentials',
+     'Invalid AWS credentials. Please check your AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY.', 401),
+    ('AWS session token has expired',
+     'AWS session token has expired. Please refresh your credentials.', 401),
+    ('Access denied',
+     'Access denied. Please check if your AWS credentials have the necessary permissions.', 403),
+)
+
+def _aws_error_response(error_msg):
+    """Map a known AWS error message to a (response, status) pair, or None."""
+    for needle, message, status in _AWS_ERRORS:
+        if needle in error_msg:
+            return jsonify({'error': message}), status
+    return None
+
+def _etag_json_response(payload):
+    """Serve a JSON payload with an ETag, answering If-None-Match with a 304."""
+    body = _json_dumps(payload)
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag})
+    return Response(
+        body,
+        mimetype='application/json',
+        headers={'ETag': etag, 'Cache-Control': 'private, must-revalidate'}
+    )
+
+def _run_search_job(bucket_name, manifest_keys, search_string):
+    """Body of /api/search, runnable on the background executor."""
+    s3_client = _get_client()
+    _touch_manifests(bucket_name, manifest_keys)
+    return search_inventory(bucket_name, manifest_keys, search_string, s3_client)
+
+def _run_path_size_job(bucket_name, manifest_keys, path_depth):
+    """Body of /api/path-size, runnable on the background executor."""
+    results = get_path_size(bucket_name, manifest_keys, path_depth)
+    return {
+        'results': results,
+        'total_size': sum(result['total_size'] for result in results),
+        'total_paths': len(results)
+    }
+
+# last_used is informational; skip re-persisting it when the prior value is
+# this recent, so repeated searches don't queue pointless cache flushes
+LAST_USED_MIN_DELTA_SECONDS = 60
+
+def _touch_manifests(bucket_name, manifest_keys):
+    """Update last_used for the given manifests, persisting only meaningful changes."""
+    manifest_cache = load_manifest_cache()
+    entries = manifest_cache.get(bucket_name)
+    if not entries:
+        return
+
+    now = datetime.now()
+    now_iso = now.isoformat()
+    touched = []
+    for manifest in manifest_keys:
+        entry = entries.get(manifest)
+        if entry is None:
+            continue
+        previous = entry.get('last_used')
+        if previous:
+            try:
+                delta = (now - datetime.fromisoformat(previous)).total_seconds()
+            except ValueError:
+                delta = None
+            if delta is not None and 0 <= delta < LAST_USED_MIN_DELTA_SECONDS:
+                continue
+        entry['last_used'] = now_iso
+        touched.append(manifest)
+
+    _persist_last_used(bucket_name, touched, now_iso)
+
+def _manifest_added_date_display(manifest):
+    """Get the display form of a manifest's added date.
+
+    Falls back to reformatting the ISO timestamp for cache entries written
+    before the display string was stored alongside it.
+    """
+    display = manifest.get('added_date_display')
+    if display is not None:
+        return display
+    return manifest['added_date'].replace('T', ' ').split('.')[0]
+
+def _json_loads(data):
+    """Deserialize JSON bytes using the fastest available library."""
+    if _fast_json is not None:
+        return _fast_json.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj):
+    """Serialize an object to JSON bytes using the fastest available library."""
+    if _fast_json is None:
+        return json.dumps(obj).encode('utf-8')
+    result = _fast_json.dumps(obj)
+    # orjson returns bytes, ujson returns str
+    return result if isinstance(result, bytes) else result.encode('utf-8')
+
 def load_bucket_history():
     """Load the list of previously used buckets."""
-    if os.path.exists(BUCKET_HISTORY_FILE):
-        with open(BUCKET_HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    # Open directly instead of paying a separate exists() stat call first
+    try:
+        with open(BUCKET_HISTORY_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return []
+
+def _atomic_write(path, data):
+    """Write bytes to a temp file with a large buffer, then swap it into place."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb', buffering=1 << 20) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
 def save_bucket_history(buckets):
     """Save the list of previously used buckets."""
-    with open(BUCKET_HISTORY_FILE, 'w') as f:
-        json.dump(buckets, f)
+    _atomic_write(BUCKET_HISTORY_FILE, _json_dumps(buckets))
+
+# The manifest cache is persisted in SQLite so a last_used bump is a single
+# indexed UPDATE instead of a full JSON rewrite. The nested dict view
+# (dest bucket -> source bucket -> manifest data) is loaded once per process
+# and kept authoritative in memory; all writers go through this module.
+_manifest_cache_mem = {'data': None}
+_manifest_cache_lock = threading.Lock()
+_manifest_db = None
+
+def _cache_db():
+    """Return the shared SQLite connection for the manifest cache."""
+    global _manifest_db
+    if _manifest_db is None:
+        conn = sqlite3.connect(MANIFEST_CACHE_DB, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS manifests (
+                dest TEXT NOT NULL,
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                added_date TEXT,
+                added_date_display TEXT,
+                last_used TEXT,
+                PRIMARY KEY (dest, source)
+            )
+        ''')
+        conn.commit()
+        _manifest_db = conn
+    return _manifest_db
+
+def _migrate_legacy_json_cache(conn):
+    """Import a pre-SQLite manifest_cache.json into the database, then drop it."""
+    try:
+        with open(MANIFEST_CACHE_FILE, 'rb') as f:
+            legacy = _json_loads(f.read())
+    except FileNotFoundError:
+        return
+
+    rows = [
+        (dest, source, entry.get('key'), entry.get('added_date'),
+         entry.get('added_date_display'), entry.get('last_used'))
+        for dest, sources in legacy.items()
+        for source, entry in sources.items()
+    ]
+    if rows:
+        conn.executemany(
+            'INSERT OR REPLACE INTO manifests '
+            '(dest, source, key, added_date, added_date_display, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        conn.commit()
+    os.remove(MANIFEST_CACHE_FILE)
+    logger.info(f"Migrated {len(rows)} manifest cache entries from JSON to SQLite")
+
+# Bound the manifest cache so it cannot grow (and slow every load) forever;
+# eviction drops the least recently used entries down to 80% of the limit
+MAX_MANIFEST_CACHE_ENTRIES = 10000
+
+def _evict_stale_manifests(conn):
+    """Drop the oldest manifest rows when the cache exceeds its size bound."""
+    count = conn.execute('SELECT COUNT(*) FROM manifests').fetchone()[0]
+    if count <= MAX_MANIFEST_CACHE_ENTRIES:
+        return
+    keep = int(MAX_MANIFEST_CACHE_ENTRIES * 0.8)
+    conn.execute(
+        'DELETE FROM manifests WHERE rowid IN ('
+        'SELECT rowid FROM manifests ORDER BY last_used LIMIT ?)',
+        (count - keep,))
+    conn.commit()
+    logger.info(f"Evicted {count - keep} least recently used manifest cache entries")
 
 def load_manifest_cache():
-    """Load the manifest cache."""
-    if os.path.exists(MANIFEST_CACHE_FILE):
-        with open(MANIFEST_CACHE_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    """Load the manifest cache, reading from SQLite only on first use."""
+    with _manifest_cache_lock:
+        if _manifest_cache_mem['data'] is not None:
+            return _manifest_cache_mem['data']
+
+        conn = _cache_db()
+        if conn.execute('SELECT COUNT(*) FROM manifests').fetchone()[0] == 0:
+            _migrate_legacy_json_cache(conn)
+        _evict_stale_manifests(conn)
+
+        cache = {}
+        for dest, source, key, added_date, added_date_display, last_used in conn.execute(
+                'SELECT dest, source, key, added_date, added_date_display, last_used FROM manifests'):
+            entry = {'key': key, 'added_date': added_date, 'last_used': last_used}
+            if added_date_display is not None:
+                entry['added_date_display'] = added_date_display
+            cache.setdefault(dest, {})[source] = entry
+
+        _manifest_cache_mem['data'] = cache
+        return cache
 
-def save_manifest_cache(cache):
-    """Save the manifest cache."""
-    with open(MANIFEST_CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=4)
+def _persist_manifest_rows(rows):
+    """Upsert (dest, source, key, added_date, added_date_display, last_used) rows."""
+    if not rows:
+        return
+    with _manifest_cache_lock:
+        conn = _cache_db()
+        conn.executemany(
+            'INSERT OR REPLACE INTO manifests '
+            '(dest, source, key, added_date, added_date_display, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        conn.commit()
+
+def _persist_last_used(bucket_name, sources, now_iso):
+    """Update last_used for the given (dest, source) pairs with one indexed UPDATE each."""
+    if not sources:
+        return
+    with _manifest_cache_lock:
+        conn = _cache_db()
+        conn.executemany(
+            'UPDATE manifests SET last_used = ? WHERE dest = ? AND source = ?',
+            [(now_iso, bucket_name, source) for source in sources])
+        conn.commit()
 
 def clear_manifest_cache():
     """Clear the manifest cache."""
-    if os.path.exists(MANIFEST_CACHE_FILE):
-        os.remove(MANIFEST_CACHE_FILE)
+    with _manifest_cache_lock:
+        _manifest_cache_mem['data'] = None
+        conn = _cache_db()
+        conn.execute('DELETE FROM manifests')
+        conn.commit()
+        # Also drop any legacy JSON cache so it isn't re-imported
+        try:
+            os.remove(MANIFEST_CACHE_FILE)
+        except FileNotFoundError:
+            pass
         logger.info("Manifest cache cleared")
 
 @app.route('/')
@@ -64,7 +382,7 @@ def index():
 @app.route('/api/buckets', methods=['GET'])
 def get_buckets():
     """Get the list of previously used buckets."""
-    return jsonify(load_bucket_history())
+    return _etag_json_response(load_bucket_history())
 
 @app.route('/api/buckets', methods=['POST'])
 def add_bucket():
@@ -74,12 +392,14 @@ def add_bucket():
     
     # Load existing history
     buckets = load_bucket_history()
-    
-    # Add new buckets if they don't exist
+
+    # Add new buckets if they don't exist, using a set for O(1) membership checks
+    existing = set(buckets)
     for bucket in bucket_names:
-        if bucket not in buckets:
+        if bucket not in existing:
             buckets.append(bucket)
-    
+            existing.add(bucket)
+
     # Save updated history
     save_bucket_history(buckets)
     
@@ -119,21 +439,15 @@ def get_manifests():
         
         # Initialize S3 client using environment variables
         try:
-            s3_client = get_s3_client()
+            s3_client = _get_client()
             logger.debug("S3 client initialized successfully")
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Failed to initialize S3 client: {error_msg}")
-            if "Missing required AWS credentials" in error_msg:
-                return jsonify({'error': 'AWS credentials are missing. Please check your .env file.'}), 401
-            elif "Invalid AWS credentials" in error_msg:
-                return jsonify({'error': 'Invalid AWS credentials. Please check your AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY.'}), 401
-            elif "AWS session token has expired" in error_msg:
-                return jsonify({'error': 'AWS session token has expired. Please refresh your credentials.'}), 401
-            elif "Access denied" in error_msg:
-                return jsonify({'error': 'Access denied. Please check if your AWS credentials have the necessary permissions.'}), 403
-            else:
-                return jsonify({'error': f'Failed to initialize S3 client: {error_msg}'}), 500
+            response = _aws_error_response(error_msg)
+            if response is not None:
+                return response
+            return jsonify({'error': f'Failed to initialize S3 client: {error_msg}'}), 500
         
         # Load existing cache
         manifest_cache = load_manifest_cache()
@@ -146,46 +460,51 @@ def get_manifests():
             logger.warning("No manifests found for any buckets")
             return jsonify({'error': 'No manifests found. Please check if the buckets have S3 inventory configured.'}), 404
         
-        # Update cache with new manifests
-        current_time = datetime.now().isoformat()
-        for dest_bucket in bucket_names:  # Use selected bucket as destination bucket
-            # Create a new bucket object if it doesn't exist
-            if dest_bucket not in manifest_cache:
-                manifest_cache[dest_bucket] = {}
-            
-            # Get manifests for this destination bucket
-            for source_bucket, manifests in latest_manifests.items():
-                for manifest in manifests:
-                    # Add the manifest to the destination bucket's account
-                    manifest_data = {
-                        'key': manifest['key'],
-                        'added_date': current_time,
-                        'last_used': current_time
-                    }
-                    manifest_cache[dest_bucket][source_bucket] = manifest_data
-                    logger.debug(f"Added manifest to cache: {manifest['key']}")  # Simplified logging
-        
-        # Save updated cache
-        save_manifest_cache(manifest_cache)
-        logger.debug("Updated manifest cache")
-        
-        # Convert the cache format to match the expected response format
+        # Update cache with new manifests, storing the display string once so
+        # reads never have to reformat the ISO timestamp per record
+        now = datetime.now()
+        current_time = now.isoformat()
+        current_time_display = now.strftime('%Y-%m-%d %H:%M:%S')
         response_data = {}
-        for bucket in bucket_names:
-            if bucket in manifest_cache:
-                response_data[bucket] = [
+        new_rows = []
+        # The in-memory cache is shared across request threads and the job
+        # executor; hold the lock while mutating it so concurrent readers
+        # never see a dict change size mid-iteration
+        with _manifest_cache_lock:
+            for dest_bucket in bucket_names:  # Use selected bucket as destination bucket
+                # Create a new bucket object if it doesn't exist
+                bucket_entries = manifest_cache.setdefault(dest_bucket, {})
+
+                # Get manifests for this destination bucket
+                for source_bucket, manifests in latest_manifests.items():
+                    for manifest in manifests:
+                        # Add the manifest to the destination bucket's account
+                        bucket_entries[source_bucket] = {
+                            'key': manifest['key'],
+                            'added_date': current_time,
+                            'added_date_display': current_time_display,
+                            'last_used': current_time
+                        }
+                        new_rows.append((dest_bucket, source_bucket, manifest['key'],
+                                         current_time, current_time_display, current_time))
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Added manifest to cache: {manifest['key']}")
+
+                # Build the response for this bucket in the same pass over the cache
+                response_data[dest_bucket] = [
                     {
                         'key': manifest['key'],
-                        'added_date': manifest['added_date'].replace('T', ' ').split('.')[0],
+                        'added_date': _manifest_added_date_display(manifest),
                         'source_bucket': source_bucket  # Add source bucket information
                     }
-                    for source_bucket, manifest in manifest_cache[bucket].items()
+                    for source_bucket, manifest in bucket_entries.items()
                 ]
-                logger.debug(f"Added {len(response_data[bucket])} manifests to response for bucket {bucket}")
-            else:
-                response_data[bucket] = []
-                logger.debug(f"No manifests found for bucket {bucket}")
-        
+                logger.debug(f"Added {len(response_data[dest_bucket])} manifests to response for bucket {dest_bucket}")
+
+        # Persist only the rows added in this request
+        _persist_manifest_rows(new_rows)
+        logger.debug("Updated manifest cache")
+
         logger.info(f"Successfully retrieved manifests for {len(response_data)} buckets")
         return jsonify(response_data)
     except Exception as e:
@@ -203,22 +522,25 @@ def get_cached_manifests():
     try:
         manifest_cache = load_manifest_cache()
         result = {}
-        
-        for bucket in bucket_names:
-            if bucket in manifest_cache:
-                result[bucket] = [
-                    {
-                        'key': manifest['key'],
-                        'added_date': manifest['added_date'].replace('T', ' ').split('.')[0],
-                        'source_bucket': source_bucket  # Add source bucket information
-                    }
-                    for source_bucket, manifest in manifest_cache[bucket].items()
-                ]
-                logger.info(f"Found {len(result[bucket])} manifests for bucket {bucket}")
-            else:
-                result[bucket] = []
-                logger.info(f"No manifests found for bucket {bucket}")
-        return jsonify(result)
+
+        # Iterate under the cache lock so a concurrent get_manifests insert
+        # can't resize the dicts mid-iteration
+        with _manifest_cache_lock:
+            for bucket in bucket_names:
+                if bucket in manifest_cache:
+                    result[bucket] = [
+                        {
+                            'key': manifest['key'],
+                            'added_date': _manifest_added_date_display(manifest),
+                            'source_bucket': source_bucket  # Add source bucket information
+                        }
+                        for source_bucket, manifest in manifest_cache[bucket].items()
+                    ]
+                    logger.info(f"Found {len(result[bucket])} manifests for bucket {bucket}")
+                else:
+                    result[bucket] = []
+                    logger.info(f"No manifests found for bucket {bucket}")
+        return _etag_json_response(result)
     except Exception as e:
         logger.error(f"Error getting cached manifests: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -231,26 +553,27 @@ def search():
     manifest_keys = data.get('manifest_keys', [])
     search_string = data.get('search_string')
     
-    if not all([bucket_name, manifest_keys, search_string]):
+    if not (bucket_name and manifest_keys and search_string):
         return jsonify({'error': 'Missing required parameters'}), 400
-    
+
+    # Run on the background executor and let the client poll /api/jobs/<id>
+    if data.get('async'):
+        job_id = _submit_job(_run_search_job, bucket_name, manifest_keys, search_string)
+        return jsonify({'job_id': job_id}), 202
+
     try:
         # Initialize S3 client using environment variables
-        s3_client = get_s3_client()
-        
+        s3_client = _get_client()
+
         # Update last used timestamp for manifests
-        manifest_cache = load_manifest_cache()
-        if bucket_name in manifest_cache:
-            for manifest in manifest_keys:
-                if manifest in manifest_cache[bucket_name]:
-                    manifest_cache[bucket_name][manifest]['last_used'] = datetime.now().isoformat()
-            save_manifest_cache(manifest_cache)
-        
+        _touch_manifests(bucket_name, manifest_keys)
+
         try:
             results = search_inventory(bucket_name, manifest_keys, search_string, s3_client)
-            logger.debug(f"Search returned results of type: {results.get('type')}")
-            logger.debug(f"Search results structure: {json.dumps(results, indent=2)}")
-            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Search returned results of type: {results.get('type')}")
+                logger.debug(f"Search results structure: {json.dumps(results, indent=2)}")
+
             # Results are already in the correct format, just return them
             return jsonify(results)
         except Exception as e:
@@ -259,17 +582,11 @@ def search():
             return jsonify({'error': str(e)}), 500
     except Exception as e:
         error_msg = str(e)
-        if "Missing required AWS credentials" in error_msg:
-            return jsonify({'error': 'AWS credentials are missing. Please check your .env file.'}), 401
-        elif "Invalid AWS credentials" in error_msg:
-            return jsonify({'error': 'Invalid AWS credentials. Please check your AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY.'}), 401
-        elif "AWS session token has expired" in error_msg:
-            return jsonify({'error': 'AWS session token has expired. Please refresh your credentials.'}), 401
-        elif "Access denied" in error_msg:
-            return jsonify({'error': 'Access denied. Please check if your AWS credentials have the necessary permissions.'}), 403
-        else:
-            logger.error(f"Error searching inventory: {error_msg}")
-            return jsonify({'error': error_msg}), 500
+        response = _aws_error_response(error_msg)
+        if response is not None:
+            return response
+        logger.error(f"Error searching inventory: {error_msg}")
+        return jsonify({'error': error_msg}), 500
 
 @app.route('/api/path-size', methods=['POST'])
 def calculate_path_size():
@@ -279,23 +596,18 @@ def calculate_path_size():
         manifest_keys = data.get('manifest_keys')
         path_depth = data.get('path_depth')
 
-        if not all([bucket_name, manifest_keys, path_depth]):
+        if not (bucket_name and manifest_keys and path_depth):
             return jsonify({'error': 'Missing required parameters'}), 400
 
         if not isinstance(path_depth, int) or path_depth < 1:
             return jsonify({'error': 'Path depth must be a positive integer'}), 400
 
-        results = get_path_size(bucket_name, manifest_keys, path_depth)
-        
-        # Calculate totals
-        total_size = sum(result['total_size'] for result in results)
-        total_paths = len(results)
+        # Run on the background executor and let the client poll /api/jobs/<id>
+        if data.get('async'):
+            job_id = _submit_job(_run_path_size_job, bucket_name, manifest_keys, path_depth)
+            return jsonify({'job_id': job_id}), 202
 
-        return jsonify({
-            'results': results,
-            'total_size': total_size,
-            'total_paths': total_paths
-        })
+        return jsonify(_run_path_size_job(bucket_name, manifest_keys, path_depth))
 
     except Exception as e:
         logger.error(f"Error calculating path size: {str(e)}")
@@ -321,12 +633,12 @@ def download_csv():
     operation_type = data.get('operation_type')
     path_depth = data.get('path_depth')
     
-    if not all([bucket_name, manifest_keys]):
+    if not (bucket_name and manifest_keys):
         return jsonify({'error': 'Missing required parameters'}), 400
     
     try:
         # Initialize S3 client using environment variables
-        s3_client = get_s3_client()
+        s3_client = _get_client()
         
         # Get results based on operation type
         if operation_type == 'search':
@@ -365,17 +677,27 @@ def download_csv():
                 'is_folder': 'Is Folder'
             })
         
-        # Create CSV in memory
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        
         # Generate filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"s3_inventory_results_{timestamp}.csv"
-        
+
+        # Write the CSV to a temp file and let send_file serve it via
+        # sendfile(2), so no copy of the data sits in user-space memory
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False,
+                                         buffering=1 << 20) as tf:
+            df.to_csv(tf, index=False)
+            tmp_path = tf.name
+
+        @after_this_request
+        def _cleanup(response):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return response
+
         return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+            tmp_path,
             mimetype='text/csv',
             as_attachment=True,
             download_name=filename
@@ -383,17 +705,11 @@ def download_csv():
         
     except Exception as e:
         error_msg = str(e)
-        if "Missing required AWS credentials" in error_msg:
-            return jsonify({'error': 'AWS credentials are missing. Please check your .env file.'}), 401
-        elif "Invalid AWS credentials" in error_msg:
-            return jsonify({'error': 'Invalid AWS credentials. Please check your AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY.'}), 401
-        elif "AWS session token has expired" in error_msg:
-            return jsonify({'error': 'AWS session token has expired. Please refresh your credentials.'}), 401
-        elif "Access denied" in error_msg:
-            return jsonify({'error': 'Access denied. Please check if your AWS credentials have the necessary permissions.'}), 403
-        else:
-            logger.error(f"Error downloading CSV: {error_msg}")
-            return jsonify({'error': error_msg}), 500
+        response = _aws_error_response(error_msg)
+        if response is not None:
+            return response
+        logger.error(f"Error downloading CSV: {error_msg}")
+        return jsonify({'error': error_msg}), 500
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -1,5 +1,12 @@
 import json
 import gzip
+import os
+import re
+import shutil
+import tempfile
+import threading
+import queue
+from collections import defaultdict
 import pandas as pd
 import argparse
 from s3_utils import get_s3_client
@@ -14,10 +21,98 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from rich.panel import Panel
 from rich import print as rprint
 import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Parallel gzip decompressor; optional, standard gzip is the fallback
+try:
+    import rapidgzip as _rapidgzip
+except ImportError:
+    _rapidgzip = None
 
 # Initialize Rich console
 console = Console()
 
+# Read buffer for gzip decompression, well above the 8KiB io default
+_GZIP_BUFFER_BYTES = 128 * 1024
+
+# Prefetch sizing: blocks streamed from S3 ahead of the parser, and how many
+# may be queued before the producer blocks
+_PREFETCH_CHUNK_BYTES = 4 * 1024 * 1024
+_PREFETCH_QUEUE_DEPTH = 8
+
+class _PrefetchReader(io.RawIOBase):
+    """
+    Raw stream that prefetches an S3 body on a background thread.
+
+    A producer thread reads fixed-size blocks from the body into a bounded
+    queue, so network round trips overlap with gzip decode and CSV parsing
+    on the consumer side instead of alternating with them.
+    """
+
+    def __init__(self, body, chunk_bytes=_PREFETCH_CHUNK_BYTES,
+                 queue_depth=_PREFETCH_QUEUE_DEPTH):
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._leftover = b''
+        self._eof = False
+        self._producer = threading.Thread(
+            target=self._produce, args=(body, chunk_bytes), daemon=True
+        )
+        self._producer.start()
+
+    def _produce(self, body, chunk_bytes):
+        try:
+            while True:
+                chunk = body.read(chunk_bytes)
+                if not chunk:
+                    break
+                self._queue.put(chunk)
+        finally:
+            # Empty sentinel marks end of stream (and any producer error)
+            self._queue.put(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._leftover and not self._eof:
+            chunk = self._queue.get()
+            if chunk:
+                self._leftover = chunk
+            else:
+                self._eof = True
+        if not self._leftover:
+            return 0
+        count = min(len(buffer), len(self._leftover))
+        buffer[:count] = self._leftover[:count]
+        self._leftover = self._leftover[count:]
+        return count
+
+def _open_inventory_stream(fileobj):
+    """
+    Open a gzipped inventory stream for binary reading.
+
+    Uses rapidgzip's multi-core decompressor when installed; gzip decode is
+    CPU-bound on inventory-sized files, so it parallelizes well. rapidgzip
+    needs a seekable source, so the compressed bytes are spooled to a
+    temporary file first. Otherwise the body is wrapped in a prefetching
+    reader so S3 GET latency is hidden behind the standard single-threaded
+    decompressor, sitting behind a larger buffer.
+    """
+    if _rapidgzip is not None:
+        tmp = tempfile.NamedTemporaryFile(suffix='.gz', delete=False)
+        try:
+            shutil.copyfileobj(fileobj, tmp, 1 << 20)
+            tmp.close()
+            return _rapidgzip.open(tmp.name, parallelization=0)  # 0 = auto-detect cores
+        finally:
+            # The decompressor holds its own handle; drop the directory entry
+            os.unlink(tmp.name)
+    prefetched = _PrefetchReader(fileobj)
+    return io.BufferedReader(gzip.GzipFile(fileobj=prefetched),
+                             buffer_size=_GZIP_BUFFER_BYTES)
+
 def format_size(size_bytes: int) -> str:
     """Format size in bytes to human readable format."""
     for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -29,32 +124,54 @@ def format_size(size_bytes: int) -> str:
 def is_folder_match(key: str, search_string: str) -> bool:
     """
     Check if the search string matches a folder name in the path.
-    
+
+    A hit counts as a folder match when a '/' follows it, i.e. the match sits
+    in a non-final path segment. Index arithmetic avoids allocating a list of
+    segment strings per key. A needle containing '/' spans segments and can
+    never sit inside one, so it is never a folder match.
+
     :param key: S3 object key
     :param search_string: String to search for
     :return: True if search string matches a folder name
     """
-    # Split the path into components
-    parts = key.split('/')
-    # Check each part except the last one (which is the file name)
-    return any(search_string.lower() in part.lower() for part in parts[:-1])
+    if '/' in search_string:
+        return False
+    hit = key.lower().find(search_string.lower())
+    return hit >= 0 and key.find('/', hit) >= 0
 
 def get_folder_path(key: str, search_string: str) -> str:
     """
     Get the folder path that contains the search string.
-    
+
     :param key: S3 object key
     :param search_string: String to search for
     :return: Folder path containing the search string
     """
-    parts = key.split('/')
-    for i, part in enumerate(parts):
-        if search_string.lower() in part.lower():
-            # Return the path up to and including the matching folder
-            return '/'.join(parts[:i+1])
-    return key
-
-def process_inventory_file(s3_client, bucket_name: str, file_info: Dict[str, Any], 
+    return _folder_path_fast(key, search_string.lower())
+
+def _folder_path_fast(key: str, needle_lower: str) -> str:
+    """
+    Folder path up to and including the segment containing the needle.
+
+    Uses index arithmetic instead of split('/') so no per-key list of
+    segment strings is allocated; the needle must already be lowercased.
+    A needle containing '/' can never sit inside a single segment, so the
+    key is returned whole — otherwise the slash search would stop at the
+    '/' inside the needle and truncate the path mid-match.
+
+    :param key: S3 object key
+    :param needle_lower: Lowercased search string
+    :return: Folder path containing the needle, or the key itself
+    """
+    if '/' in needle_lower:
+        return key
+    hit = key.lower().find(needle_lower)
+    if hit < 0:
+        return key
+    slash = key.find('/', hit)
+    return key if slash < 0 else key[:slash]
+
+def process_inventory_file(s3_client, bucket_name: str, file_info: Dict[str, Any],
                          search_string: str, columns: List[str], dtypes: Dict[str, str],
                          progress: Progress, task_id: int) -> pd.DataFrame:
     """
@@ -63,37 +180,63 @@ def process_inventory_file(s3_client, bucket_name: str, file_info: Dict[str, Any
     try:
         # Get the file
         file_obj = s3_client.get_object(Bucket=bucket_name, Key=file_info["key"])
-        
-        # Process the file in chunks
-        chunk_size = 100000
-        matching_chunks = []
-        
-        with gzip.open(file_obj["Body"], mode='rt') as buffer:
-            for chunk in pd.read_csv(buffer, 
-                                   dtype=dtypes, 
-                                   low_memory=False,
-                                   chunksize=chunk_size):
-                chunk.columns = columns
-                
-                # Check for folder matches
-                folder_matches = chunk[chunk['Key'].apply(lambda x: is_folder_match(x, search_string))]
-                if not folder_matches.empty:
-                    folder_matches.loc[:, 'Folder_Path'] = folder_matches['Key'].apply(
-                        lambda x: get_folder_path(x, search_string)
-                    )
-                    matching_chunks.append(folder_matches)
-                
-                # Also check for direct matches in case there are no folder matches
-                direct_matches = chunk[chunk['Key'].str.contains(search_string, case=False, na=False)]
-                if not direct_matches.empty and folder_matches.empty:
-                    matching_chunks.append(direct_matches)
-                
-                # Update progress
-                progress.update(task_id, advance=len(chunk))
-        
-        if matching_chunks:
-            return pd.concat(matching_chunks)
-        return pd.DataFrame()
+
+        # Match rates are typically well under 1%, so building pandas chunks
+        # just to discard almost every row is wasted allocation. Prefilter the
+        # raw lines with a bytes substring test and parse only the survivors
+        # with a single read_csv call at the end
+        needle_lower = search_string.lower()
+        needle_bytes = needle_lower.encode('utf-8')
+        progress_batch = 100000
+
+        matched_lines = []
+        lines_seen = 0
+        with _open_inventory_stream(file_obj["Body"]) as gz:
+            for line in gz:
+                if needle_bytes in line.lower():
+                    matched_lines.append(line)
+                lines_seen += 1
+                if lines_seen % progress_batch == 0:
+                    progress.update(task_id, advance=progress_batch)
+        progress.update(task_id, advance=lines_seen % progress_batch)
+
+        if not matched_lines:
+            return pd.DataFrame()
+
+        # Explicit dtypes from the caller mean no inference pass, and
+        # limiting NA detection to empty fields skips the default NA-token
+        # scan over the string columns
+        df = pd.read_csv(io.BytesIO(b''.join(matched_lines)),
+                         names=columns,
+                         dtype=dtypes,
+                         keep_default_na=False,
+                         na_values=[''])
+
+        # The byte prefilter matches anywhere in the line — bucket name,
+        # dates, storage class — so narrow to hits in the Key column before
+        # the folder/direct split
+        df = df[df['Key'].str.contains(needle_lower, case=False, regex=False, na=False)]
+        if df.empty:
+            return pd.DataFrame()
+
+        # A folder match is a hit inside a non-final path segment, i.e. the
+        # needle is followed by a '/' later in the key
+        needle = re.escape(needle_lower)
+        folder_pattern = re.compile(needle + r'[^/]*/')
+        # Captures the path up to and including the first segment with a hit
+        folder_path_pattern = re.compile(r'^((?:[^/]*/)*?[^/]*' + needle + r'[^/]*)', re.IGNORECASE)
+
+        folder_matches = df[df['Key'].str.lower().str.contains(folder_pattern, na=False)]
+        if not folder_matches.empty:
+            folder_matches = folder_matches.copy()
+            folder_matches['Folder_Path'] = folder_matches['Key'].str.extract(
+                folder_path_pattern
+            )[0]
+            return folder_matches
+
+        # Every surviving row now has the needle in its Key, so with no
+        # folder hits they are all direct object matches
+        return df
         
     except Exception as e:
         console.print(f"[red]Error processing file {file_info['key']}: {e}[/red]")
@@ -101,6 +244,12 @@ def process_inventory_file(s3_client, bucket_name: str, file_info: Dict[str, Any
 
 def display_results(folder_summary: pd.DataFrame, is_folder_match: bool):
     """Display results in a formatted table."""
+    # When output is piped, skip Rich's per-cell layout work entirely and
+    # stream plain CSV, which downstream grep/awk can consume directly
+    if not console.is_terminal:
+        folder_summary.to_csv(sys.stdout, index=False)
+        return
+
     if is_folder_match:
         table = Table(title="Folder Search Results", show_header=True, header_style="bold magenta")
         table.add_column("Folder Path", style="cyan")
@@ -128,6 +277,199 @@ def display_results(folder_summary: pd.DataFrame, is_folder_match: bool):
     
     console.print(table)
 
+# Parsed manifests keyed by (bucket, key, etag); repeat searches against an
+# unchanged manifest skip the fetch and JSON parse entirely
+_MANIFEST_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_manifest_cache_lock = threading.Lock()
+
+def _get_manifest(s3_client, bucket_name: str, manifest_key: str) -> Dict[str, Any]:
+    """
+    Fetch and parse a manifest, reusing a cached copy while its ETag matches.
+
+    :param s3_client: boto3 S3 client
+    :param bucket_name: Name of the S3 bucket
+    :param manifest_key: Key of the manifest JSON file
+    :return: Parsed manifest dictionary
+    """
+    head = s3_client.head_object(Bucket=bucket_name, Key=manifest_key)
+    cache_key = (bucket_name, manifest_key, head['ETag'])
+
+    with _manifest_cache_lock:
+        manifest = _MANIFEST_CACHE.get(cache_key)
+    if manifest is not None:
+        return manifest
+
+    response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
+    manifest = json.loads(response['Body'].read().decode('utf-8'))
+    with _manifest_cache_lock:
+        _MANIFEST_CACHE[cache_key] = manifest
+    return manifest
+
+def _select_matching_rows(s3_client, bucket_name: str, inventory_key: str, search_string: str):
+    """
+    Filter an inventory file server-side with S3 Select.
+
+    Only rows whose key column contains the search string are returned, so the
+    download shrinks from the full inventory to roughly the match set.
+
+    :param s3_client: boto3 S3 client
+    :param bucket_name: Name of the S3 bucket
+    :param inventory_key: Key of the gzipped inventory CSV
+    :param search_string: Substring to match against object keys
+    :return: DataFrame of matching rows, or None if S3 Select failed and the
+             caller should fall back to downloading the whole file
+    """
+    # Single quotes must be doubled inside an S3 Select string literal
+    needle = search_string.lower().replace("'", "''")
+    expression = f"SELECT * FROM S3Object s WHERE LOWER(s._2) LIKE '%{needle}%'"
+
+    try:
+        response = s3_client.select_object_content(
+            Bucket=bucket_name,
+            Key=inventory_key,
+            ExpressionType='SQL',
+            Expression=expression,
+            InputSerialization={'CSV': {'FileHeaderInfo': 'NONE'}, 'CompressionType': 'GZIP'},
+            OutputSerialization={'CSV': {}}
+        )
+
+        buffer = io.BytesIO()
+        for event in response['Payload']:
+            if 'Records' in event:
+                buffer.write(event['Records']['Payload'])
+    except Exception as e:
+        logger.warning(f"S3 Select failed for {inventory_key}, falling back to full download: {str(e)}")
+        return None
+
+    if buffer.tell() == 0:
+        return pd.DataFrame()
+    buffer.seek(0)
+    return pd.read_csv(buffer, header=None)
+
+def _search_one_file(s3_client, bucket_name: str, file_info: Dict[str, Any],
+                     search_string: str, source: str) -> List[Dict[str, Any]]:
+    """
+    Search a single inventory file and return its aggregated folder matches.
+
+    Errors are logged and swallowed so one bad shard doesn't abort the search.
+
+    :param s3_client: boto3 S3 client (thread-safe, shared across workers)
+    :param bucket_name: Name of the S3 bucket
+    :param file_info: Manifest file entry with the inventory shard's key
+    :param search_string: Substring to match against object keys
+    :param source: Source label derived from the manifest path
+    :return: List of folder match dictionaries
+    """
+    try:
+        inventory_key = file_info['key']
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(f"Processing inventory file: {inventory_key}")
+
+        # Push the substring filter down to S3 Select so only
+        # matching rows cross the network
+        df = _select_matching_rows(s3_client, bucket_name, inventory_key, search_string)
+        if df is None:
+            # S3 Select unavailable for this object; fall back
+            # to downloading and scanning the whole file
+            file_obj = s3_client.get_object(Bucket=bucket_name, Key=inventory_key)
+            raw = gzip.decompress(file_obj['Body'].read())
+            try:
+                # PyArrow's multithreaded CSV parser, pruned to just the key
+                # and size columns the search actually uses
+                df = pd.read_csv(io.BytesIO(raw), header=None, engine='pyarrow', usecols=[1, 2])
+                df.columns = ['Key', 'Size']
+            except (ImportError, ValueError) as e:
+                logger.debug(f"PyArrow CSV engine unavailable ({str(e)}), using default parser")
+                df = pd.read_csv(io.BytesIO(raw), header=None)
+            del raw
+
+        if df.empty:
+            if debug_enabled:
+                logger.debug(f"No matches found for '{search_string}'")
+            return []
+
+        # Name columns positionally unless the pruned read already did
+        if 'Key' not in df.columns:
+            # Get the actual number of columns
+            num_columns = len(df.columns)
+            if debug_enabled:
+                logger.debug(f"Found {num_columns} columns in inventory file")
+
+            # Define base columns that we know exist in S3 inventory
+            base_columns = ['Bucket', 'Key', 'Size', 'LastModifiedDate', 'StorageClass']
+
+            # Create column names based on actual number of columns
+            if num_columns == len(base_columns):
+                df.columns = base_columns
+            elif num_columns > len(base_columns):
+                # If we have more columns than expected, add them as Unnamed_X
+                additional_columns = [f'Unnamed_{i}' for i in range(len(base_columns), num_columns)]
+                df.columns = base_columns + additional_columns
+            else:
+                # If we have fewer columns than expected, only use the columns we have
+                df.columns = base_columns[:num_columns]
+
+        # Storage classes come from a handful of fixed values, so a
+        # categorical column stores one small code per row instead of a
+        # Python string object per row
+        if 'StorageClass' in df.columns:
+            df['StorageClass'] = df['StorageClass'].astype('category')
+
+        # Convert Size column to numeric and fill NaN with 0
+        if 'Size' in df.columns:
+            df['Size'] = pd.to_numeric(df['Size'], errors='coerce').fillna(0)
+        else:
+            # If Size column is not present, add it with zeros
+            df['Size'] = 0
+
+        if 'Key' not in df.columns:
+            # If Key column is not present, skip this file
+            logger.warning(f"Skipping file {inventory_key} - no Key column found")
+            return []
+
+        # First, find all objects that contain the search string, using a
+        # pattern compiled once instead of recompiled per shard
+        if debug_enabled:
+            logger.debug(f"Searching for '{search_string}' in {len(df)} objects")
+        pattern = re.compile(re.escape(search_string), re.IGNORECASE)
+        matches = df[df['Key'].str.contains(pattern, na=False)].copy()
+        if debug_enabled:
+            logger.debug(f"Found {len(matches)} initial matches")
+
+        if matches.empty:
+            if debug_enabled:
+                logger.debug(f"No matches found for '{search_string}'")
+            return []
+
+        # Fuse the folder-path derivation and the per-folder aggregation into
+        # one pass over the matches instead of building a Folder_Path column
+        # and running a separate groupby over the whole match set
+        needle_lower = search_string.lower()
+        folder_totals = defaultdict(lambda: [0, 0])
+        for key, size in zip(matches['Key'].to_numpy(), matches['Size'].to_numpy()):
+            totals = folder_totals[_folder_path_fast(key, needle_lower)]
+            totals[0] += size
+            totals[1] += 1
+
+        if debug_enabled:
+            logger.debug(f"Grouped into {len(folder_totals)} unique folders in {inventory_key}")
+
+        return [
+            {
+                'Folder_Path': folder_path,
+                'Source': source,
+                'Total_Size': int(total_size),
+                'File_Count': file_count,
+                'Bucket': bucket_name,
+            }
+            for folder_path, (total_size, file_count) in folder_totals.items()
+        ]
+
+    except Exception as e:
+        logger.error(f"Error processing inventory file {file_info['key']}: {str(e)}")
+        return []
+
 def search_inventory(bucket_name: str, manifest_keys: List[str], search_string: str, s3_client=None) -> Dict[str, Any]:
     """
     Search through S3 inventory files for objects matching the search string.
@@ -146,132 +488,43 @@ def search_inventory(bucket_name: str, manifest_keys: List[str], search_string:
     
     try:
         all_matches = []
-        print(f"Processing {len(manifest_keys)} manifest keys: {manifest_keys}")  # Debug log
-        
+        total_size = 0
+        logger.debug(f"Processing {len(manifest_keys)} manifest keys: {manifest_keys}")
+
         for manifest_key in manifest_keys:
             if not manifest_key or not isinstance(manifest_key, str):
-                print(f"Skipping invalid manifest key: {manifest_key}")  # Debug log
+                logger.warning(f"Skipping invalid manifest key: {manifest_key}")
                 continue
-                
+
             # Extract source from manifest path (e.g., "inventory/2024-03-21/manifest.json" -> "inventory")
             source = manifest_key.split('/')[0] if manifest_key else ''
-            print(f"Processing manifest: {manifest_key}, source: {source}")  # Debug log
-            
+            logger.debug(f"Processing manifest: {manifest_key}, source: {source}")
+
             try:
-                # Get the manifest file
-                print(f"Fetching manifest from bucket {bucket_name}, key {manifest_key}")  # Debug log
-                response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
-                manifest = json.loads(response['Body'].read().decode('utf-8'))
-                print(f"Found manifest with {len(manifest['files'])} files")
+                # Get the manifest file (cached by ETag across invocations)
+                manifest = _get_manifest(s3_client, bucket_name, manifest_key)
+                logger.debug(f"Found manifest with {len(manifest['files'])} files")
                 
-                # Process each inventory file
-                for file_info in manifest['files']:
-                    try:
-                        inventory_key = file_info['key']
-                        print(f"Processing inventory file: {inventory_key}")  # Debug log
-                        
-                        # Get the inventory file
-                        file_obj = s3_client.get_object(Bucket=bucket_name, Key=inventory_key)
-                        
-                        # Read and process the inventory file
-                        with gzip.open(file_obj['Body'], mode='rt') as buffer:
-                            # Read CSV without header to handle unnamed columns
-                            df = pd.read_csv(buffer, header=None)
-                            
-                            # Get the actual number of columns
-                            num_columns = len(df.columns)
-                            print(f"Found {num_columns} columns in inventory file")  # Debug log
-                            
-                            # Define base columns that we know exist in S3 inventory
-                            base_columns = ['Bucket', 'Key', 'Size', 'LastModifiedDate', 'StorageClass']
-                            
-                            # Create column names based on actual number of columns
-                            if num_columns == len(base_columns):
-                                df.columns = base_columns
-                            elif num_columns > len(base_columns):
-                                # If we have more columns than expected, add them as Unnamed_X
-                                additional_columns = [f'Unnamed_{i}' for i in range(len(base_columns), num_columns)]
-                                df.columns = base_columns + additional_columns
-                            else:
-                                # If we have fewer columns than expected, only use the columns we have
-                                df.columns = base_columns[:num_columns]
-                            
-                            # Convert Size column to numeric and fill NaN with 0
-                            if 'Size' in df.columns:
-                                df['Size'] = pd.to_numeric(df['Size'], errors='coerce').fillna(0)
-                            else:
-                                # If Size column is not present, add it with zeros
-                                df['Size'] = 0
-                            
-                            # Search for matches
-                            if 'Key' in df.columns:
-                                # First, find all objects that contain the search string
-                                print(f"Searching for '{search_string}' in {len(df)} objects")  # Debug log
-                                matches = df[df['Key'].str.contains(search_string, case=False, na=False)].copy()
-                                print(f"Found {len(matches)} initial matches")  # Debug log
-                                
-                                if not matches.empty:
-                                    # Add source information before processing
-                                    matches['Source'] = source
-                                    
-                                    # For each matching object, find its containing folder
-                                    def get_folder_path(key, search_str):
-                                        parts = key.split('/')
-                                        for i, part in enumerate(parts):
-                                            if search_str.lower() in part.lower():
-                                                # Return the path up to and including the matching folder
-                                                folder_path = '/'.join(parts[:i+1])
-                                                print(f"Found matching folder: {folder_path}")  # Debug log
-                                                return folder_path
-                                        return key
-
-                                    matches['Folder_Path'] = matches['Key'].apply(
-                                        lambda x: get_folder_path(x, search_string)
-                                    )
-                                    
-                                    # Group by folder path and source
-                                    folder_matches = matches.groupby(['Folder_Path', 'Source']).agg({
-                                        'Size': ['sum', 'count']
-                                    }).reset_index()
-                                    
-                                    # Rename columns
-                                    folder_matches.columns = ['Folder_Path', 'Source', 'Total_Size', 'File_Count']
-                                    
-                                    # Add bucket information
-                                    folder_matches['Bucket'] = bucket_name
-                                    
-                                    print(f"Grouped into {len(folder_matches)} unique folders")  # Debug log
-                                    print("Folder matches:")  # Debug log
-                                    for _, row in folder_matches.iterrows():
-                                        print(f"  {row['Folder_Path']} - {row['Total_Size']} bytes, {row['File_Count']} files")  # Debug log
-                                    
-                                    # Convert to list of dictionaries and handle NaN values
-                                    folder_results = folder_matches.to_dict('records')
-                                    for result in folder_results:
-                                        # Convert any remaining NaN values to None
-                                        for key, value in result.items():
-                                            if pd.isna(value):
-                                                result[key] = None
-                                    
-                                    all_matches.extend(folder_results)
-                                else:
-                                    print(f"No matches found for '{search_string}'")  # Debug log
-                            else:
-                                # If Key column is not present, skip this file
-                                print(f"Skipping file {inventory_key} - no Key column found")
-                                continue
-                            
-                            print(f"Found {len(matches)} matches in {inventory_key}")  # Debug log
-                            
-                    except Exception as e:
-                        print(f"Error processing inventory file {file_info['key']}: {str(e)}")
-                        continue
+                # Process the inventory files in parallel; each one is an
+                # independent S3 fetch dominated by network latency
+                with ThreadPoolExecutor(max_workers=min(8, len(manifest['files']) or 1)) as executor:
+                    futures = [
+                        executor.submit(_search_one_file, s3_client, bucket_name,
+                                        file_info, search_string, source)
+                        for file_info in manifest['files']
+                    ]
+                    for future in as_completed(futures):
+                        # Roll the totals up as results arrive so no summary
+                        # DataFrame is needed at the end
+                        matches = future.result()
+                        all_matches.extend(matches)
+                        total_size += sum(m['Total_Size'] for m in matches)
             except Exception as e:
-                print(f"Error processing manifest {manifest_key}: {str(e)}")
+                logger.error(f"Error processing manifest {manifest_key}: {str(e)}")
                 continue
-        
+
         if not all_matches:
-            print("No matches found")  # Debug log
+            logger.debug("No matches found")
             return {
                 'type': 'folders',
                 'results': [],
@@ -279,15 +532,8 @@ def search_inventory(bucket_name: str, manifest_keys: List[str], search_string:
                 'total_size': 0
             }
         
-        # Convert to DataFrame for easier processing
-        matches_df = pd.DataFrame(all_matches)
-        print(f"Total matches found: {len(matches_df)}")
-        
-        # Calculate totals
-        total_size = int(matches_df['Total_Size'].sum())
-        total_folders = len(matches_df)
-        
-        print(f"Returning {total_folders} folder matches")  # Debug log
+        total_folders = len(all_matches)
+        logger.debug(f"Returning {total_folders} folder matches")
         return {
             'type': 'folders',
             'results': all_matches,
@@ -296,7 +542,7 @@ def search_inventory(bucket_name: str, manifest_keys: List[str], search_string:
         }
         
     except Exception as e:
-        print(f"Search failed: {str(e)}")
+        logger.error(f"Search failed: {str(e)}")
         raise Exception(f"Search failed: {str(e)}")
 
 if __name__ == "__main__":
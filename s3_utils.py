@@ -2,20 +2,37 @@ from dotenv import load_dotenv
 import os
 import boto3
 import logging
+from functools import lru_cache
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+# Load environment variables from .env file once at import; re-reading the
+# file on every client request is pure I/O overhead
+load_dotenv()
+
+# Shared client configuration: the pool must be large enough for the thread
+# pools that fan GETs out across inventory shards, and adaptive retries back
+# off automatically if S3 starts throttling
+_S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'}
+)
+
+@lru_cache(maxsize=1)
 def get_s3_client():
     """
     Initialize and return an authenticated S3 client using credentials from environment variables.
-    
+
+    The client is created once and reused; boto3 clients are thread-safe and
+    share a connection pool, so repeat callers skip session setup and TLS
+    handshakes.
+
     :return: boto3 S3 client
     :raises: Exception with detailed error message if credentials are missing or invalid
     """
-    # Load environment variables from .env file
-    load_dotenv()
-
     # Read AWS access keys from environment variables
     aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
     aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
@@ -46,7 +63,7 @@ def get_s3_client():
         )
         
         # Initialize and return S3 client
-        return aws_session.client('s3')
+        return aws_session.client('s3', config=_S3_CLIENT_CONFIG)
         
     except ClientError as e:
         error_code = e.response['Error']['Code']